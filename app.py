@@ -1,17 +1,24 @@
 # app.py
 import os
-import json
+import copy
 import uuid
-import base64
+import hashlib
+import shutil
 import sqlite3
 import asyncio
+import threading
 import datetime as dt
+from collections import OrderedDict
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, List, Tuple, Optional
+from typing import Any, Dict, Iterator, List, Tuple, Optional
 
-from flask import Flask, request, jsonify, render_template
+import aiohttp
+import orjson
+import fastjsonschema
+from quart import Quart, request, jsonify, render_template
 
-from groq import Groq
+from groq import AsyncGroq, DefaultAioHttpClient
 
 
 # -----------------------------------------------------------------------------
@@ -44,9 +51,20 @@ GROQ_TEXT_MODEL = os.getenv("GROQ_TEXT_MODEL", "llama-3.1-8b-instant")
 GROQ_VISION_MODEL = os.getenv(
     "GROQ_VISION_MODEL", "meta-llama/llama-4-scout-17b-16e-instruct")
 
-# Docker image for executor (build it from ./docker/Dockerfile)
+# Docker image for executor (build it from ./docker/Dockerfile; bakes docker/runner.py)
 EXECUTOR_IMAGE = os.getenv(
     "EXECUTOR_IMAGE", "chikar-playwright-executor:latest")
+# Prewarmed pool: container "<EXECUTOR_CONTAINER>-<i>" listens on EXECUTOR_PORT + i
+EXECUTOR_CONTAINER = os.getenv("EXECUTOR_CONTAINER", "chikar-executor")
+EXECUTOR_PORT = int(os.getenv("EXECUTOR_PORT", "9222"))
+EXECUTOR_POOL_SIZE = int(os.getenv("EXECUTOR_POOL_SIZE", "2"))
+EXECUTOR_NAMES = [f"{EXECUTOR_CONTAINER}-{i}" for i in range(EXECUTOR_POOL_SIZE)]
+EXECUTOR_URLS = [
+    f"http://127.0.0.1:{EXECUTOR_PORT + i}" for i in range(EXECUTOR_POOL_SIZE)]
+# Seconds per run (also the longest a request waits for an idle executor) /
+# seconds per health-check attempt on a (re)starting container
+EXECUTOR_TIMEOUT = float(os.getenv("EXECUTOR_TIMEOUT", "180"))
+EXECUTOR_BOOT_TIMEOUT = float(os.getenv("EXECUTOR_BOOT_TIMEOUT", "30"))
 
 # Storage
 DB_PATH = os.getenv("DB_PATH", "demo.db")
@@ -64,78 +82,208 @@ DEFAULT_PRODUCT_URL = os.getenv(
 # DOM preview max chars (demo-only)
 DOM_PREVIEW_LIMIT = int(os.getenv("DOM_PREVIEW_LIMIT", "1000"))
 
-app = Flask(__name__)
-groq_client = Groq(api_key=GROQ_API_KEY) if GROQ_API_KEY else None
+app = Quart(__name__)
+
+# Loop-bound clients, created in before_serving on the serving event loop:
+#   - one Groq client (one aiohttp keep-alive pool) for the process lifetime
+#   - keep-alive session to the executor containers + queue of idle executor URLs
+groq_client: Optional[AsyncGroq] = None
+executor_session: Optional[aiohttp.ClientSession] = None
+executor_pool: Optional["asyncio.Queue[str]"] = None
+# Background health probes (readmit_executor), cancelled in after_serving
+executor_tasks: "set[asyncio.Task]" = set()
+# Set once any executor has passed its health check
+executor_ever_healthy = False
+
+
+@app.before_serving
+async def start_services() -> None:
+    global groq_client, executor_session, executor_pool
+    if GROQ_API_KEY:
+        groq_client = AsyncGroq(
+            api_key=GROQ_API_KEY,
+            http_client=DefaultAioHttpClient(),
+            max_retries=2,
+            timeout=30.0,
+        )
+    executor_session = aiohttp.ClientSession(
+        timeout=aiohttp.ClientTimeout(total=EXECUTOR_TIMEOUT))
+    # Only executors answering GET /health enter the pool (in the background:
+    # serving starts right away, early runs wait in run_in_docker)
+    executor_pool = asyncio.Queue()
+    await start_executor_pool()
+    for url in EXECUTOR_URLS:
+        schedule_readmit(url)
+
+
+@app.after_serving
+async def stop_services() -> None:
+    for task in list(executor_tasks):
+        task.cancel()
+    await stop_executor_pool()
+    if executor_session is not None:
+        await executor_session.close()
+    if groq_client is not None:
+        await groq_client.close()
 
 
 # -----------------------------------------------------------------------------
-# SQLite (minimal)
+# SQLite (single long-lived writer, WAL)
 # -----------------------------------------------------------------------------
-def db() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH)
+def _open_write_conn() -> sqlite3.Connection:
+    conn = sqlite3.connect(
+        DB_PATH, check_same_thread=False, timeout=30, isolation_level=None)
     conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=30000")
     return conn
 
 
+_WRITE_CONN = _open_write_conn()
+# A thread lock, not asyncio.Lock: only held around synchronous statements
+# (never across an await), and safe whatever thread/loop serves the request.
+_WRITE_LOCK = threading.Lock()
+
+
+@contextmanager
+def db() -> Iterator[sqlite3.Connection]:
+    """
+    Check out the shared write connection (one writer at a time).
+    The handle stays open for the process lifetime: no per-request connect.
+    """
+    with _WRITE_LOCK:
+        yield _WRITE_CONN
+
+
 def init_db() -> None:
-    with db() as conn:
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS runs (
-                id TEXT PRIMARY KEY,
-                created_at TEXT NOT NULL,
-                user_goal TEXT NOT NULL,
-                plan_json TEXT NOT NULL,
-                result_json TEXT
-            )
-           """
+    _WRITE_CONN.execute(
+        """
+        CREATE TABLE IF NOT EXISTS runs (
+            id TEXT PRIMARY KEY,
+            created_at TEXT NOT NULL,
+            user_goal TEXT NOT NULL,
+            plan_json TEXT NOT NULL,
+            result_json TEXT
         )
+       """
+    )
 
 
 init_db()
 
 
+def save_run(
+    run_id: str, created_at: str, goal: str,
+    plan: List[Dict[str, Any]], result: Dict[str, Any],
+) -> None:
+    """
+    Persist a finished run (plan + result) in a single transaction.
+    """
+    with db() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO runs (id, created_at, user_goal, plan_json, result_json) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    run_id, created_at, goal,
+                    orjson.dumps(plan).decode("utf-8"),
+                    orjson.dumps(result).decode("utf-8"),
+                ),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            # Never leave the shared handle inside an open transaction
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+
+
 # -----------------------------------------------------------------------------
 # Tool schema (ONLY 3 tools)
 # -----------------------------------------------------------------------------
-ALLOWED_TOOLS = {"go", "click", "type"}
+TOOL_ARGS = {
+    "go": ("url",),
+    "click": ("text",),
+    "type": ("label", "value"),
+}
+
+PLAN_SCHEMA = {
+    "type": "array",
+    "minItems": 1,
+    "maxItems": 10,
+    "items": {
+        "type": "object",
+        "required": ["tool", "args"],
+        "properties": {
+            "tool": {"enum": list(TOOL_ARGS)},
+            "args": {"type": "object"},
+        },
+        # One if/then per tool (not oneOf) so errors name the failing field
+        "allOf": [
+            {
+                "if": {"required": ["tool"], "properties": {"tool": {"const": tool}}},
+                "then": {
+                    "properties": {
+                        "args": {
+                            "required": list(args),
+                            "additionalProperties": False,
+                            "properties": {name: {"type": "string"} for name in args},
+                        },
+                    },
+                },
+            }
+            for tool, args in TOOL_ARGS.items()
+        ],
+    },
+}
+
+# Compiled once at import; validation is then a plain function call
+_PLAN_VALIDATOR = fastjsonschema.compile(PLAN_SCHEMA)
 
 
 def validate_plan(plan: List[Dict[str, Any]]) -> Tuple[bool, str]:
     """
-    Validate the planner's JSON plan.
+    Validate the planner's JSON plan against PLAN_SCHEMA.
     Hard guardrails prevent the LLM from escaping the tool sandbox.
     """
-    if not isinstance(plan, list):
-        return False, "Plan must be a list."
-    if len(plan) == 0:
-        return False, "Plan is empty."
-    if len(plan) > 10:
-        return False, "Plan too long (max 10 steps)."
-
-    for i, step in enumerate(plan):
-        if not isinstance(step, dict):
-            return False, f"Step {i} must be an object."
-        tool = step.get("tool")
-        args = step.get("args", {})
-        if tool not in ALLOWED_TOOLS:
-            return False, f"Step {i}: tool '{tool}' not allowed."
-        if not isinstance(args, dict):
-            return False, f"Step {i}: args must be an object."
-
-        if tool == "go":
-            if set(args.keys()) != {"url"}:
-                return False, f"Step {i}: go expects args {{url}} only."
-        elif tool == "click":
-            if set(args.keys()) != {"text"}:
-                return False, f"Step {i}: click expects args {{text}} only."
-        elif tool == "type":
-            if set(args.keys()) != {"label", "value"}:
-                return False, f"Step {i}: type expects args {{label, value}} only."
-
+    try:
+        _PLAN_VALIDATOR(plan)
+    except fastjsonschema.JsonSchemaException as e:
+        return False, e.message
     return True, "ok"
 
 
+# -----------------------------------------------------------------------------
+# LRU caches (planner + vision): repeated demo runs skip the Groq round-trip
+# -----------------------------------------------------------------------------
+CACHE_MAX_ENTRIES = 256
+
+_plan_cache: "OrderedDict[Tuple[str, str], List[Dict[str, Any]]]" = OrderedDict()
+_vision_cache: "OrderedDict[str, str]" = OrderedDict()
+
+
+def cache_get(cache: OrderedDict, key: Any) -> Any:
+    """
+    Return the cached value (or None) and mark it most recently used.
+    """
+    value = cache.get(key)
+    if value is not None:
+        cache.move_to_end(key)
+    return value
+
+
+def cache_put(cache: OrderedDict, key: Any, value: Any) -> None:
+    """
+    Insert a value, evicting the least recently used entry when full.
+    """
+    cache[key] = value
+    cache.move_to_end(key)
+    if len(cache) > CACHE_MAX_ENTRIES:
+        cache.popitem(last=False)
+
+
 # -----------------------------------------------------------------------------
 # Planner (Groq SDK)
 # -----------------------------------------------------------------------------
@@ -160,10 +308,16 @@ def deterministic_demo_plan(note_text: str) -> List[Dict[str, Any]]:
 async def groq_plan(user_goal: str, note_text: str) -> List[Dict[str, Any]]:
     """
     Planner returns ONLY JSON (no markdown).
+    Valid plans are cached per (user_goal, note_text).
     """
     if not groq_client:
         return deterministic_demo_plan(note_text)
 
+    key = (user_goal, note_text)
+    cached = cache_get(_plan_cache, key)
+    if cached is not None:
+        return copy.deepcopy(cached)
+
     system = (
         "You are a planning agent. Output ONLY valid JSON (no markdown). "
         "Return a list of steps. Each step must be one of:\n"
@@ -185,25 +339,23 @@ async def groq_plan(user_goal: str, note_text: str) -> List[Dict[str, Any]]:
         f"Note text to type: {note_text}\n"
     )
 
-    def _call() -> str:
-        completion = groq_client.chat.completions.create(
-            model=GROQ_TEXT_MODEL,
-            messages=[
-                {"role": "system", "content": system},
-                {"role": "user", "content": user_goal},
-            ],
-            temperature=0.2,
-            max_completion_tokens=600,
-        )
-        return completion.choices[0].message.content.strip()
-
-    content = await asyncio.to_thread(_call)
+    completion = await groq_client.chat.completions.create(
+        model=GROQ_TEXT_MODEL,
+        messages=[
+            {"role": "system", "content": system},
+            {"role": "user", "content": user_goal},
+        ],
+        temperature=0.2,
+        max_completion_tokens=600,
+    )
+    content = completion.choices[0].message.content.strip()
 
     try:
-        plan = json.loads(content)
+        plan = orjson.loads(content)
         ok, msg = validate_plan(plan)
         if not ok:
             return deterministic_demo_plan(note_text)
+        cache_put(_plan_cache, key, copy.deepcopy(plan))
         return plan
     except Exception:
         return deterministic_demo_plan(note_text)
@@ -212,23 +364,20 @@ async def groq_plan(user_goal: str, note_text: str) -> List[Dict[str, Any]]:
 # -----------------------------------------------------------------------------
 # Optional: Vision verification (Groq Vision)
 # -----------------------------------------------------------------------------
-def encode_image_b64(path: Path) -> str:
-    """
-    Encode an image file to base64 for Groq vision input.
-    """
-    data = path.read_bytes()
-    return base64.b64encode(data).decode("utf-8")
-
-
-async def groq_vision_verify(image_path: Path) -> Optional[str]:
+async def groq_vision_verify(b64: str) -> Optional[str]:
     """
     Demo-only: Ask the vision model to confirm the cart page and special instructions box.
+    Takes the base64 PNG returned by the executor (no disk read here).
     Returns a short text verification, or None if no GROQ_API_KEY.
+    Summaries are cached per screenshot content (blake2b digest).
     """
     if not groq_client:
         return None
 
-    b64 = await asyncio.to_thread(encode_image_b64, image_path)
+    key = hashlib.blake2b(b64.encode("ascii"), digest_size=16).hexdigest()
+    cached = cache_get(_vision_cache, key)
+    if cached is not None:
+        return cached
 
     prompt = (
         "You are verifying a demo run. "
@@ -239,8 +388,8 @@ async def groq_vision_verify(image_path: Path) -> Optional[str]:
         "Reply with a short verification summary."
     )
 
-    def _call() -> str:
-        completion = groq_client.chat.completions.create(
+    try:
+        completion = await groq_client.chat.completions.create(
             model=GROQ_VISION_MODEL,
             messages=[
                 {
@@ -257,202 +406,225 @@ async def groq_vision_verify(image_path: Path) -> Optional[str]:
             temperature=0.2,
             max_completion_tokens=250,
         )
-        return completion.choices[0].message.content.strip()
-
-    try:
-        return await asyncio.to_thread(_call)
+        summary = completion.choices[0].message.content.strip()
     except Exception:
         return None
 
+    cache_put(_vision_cache, key, summary)
+    return summary
+
 
 # -----------------------------------------------------------------------------
-# Executor: run Playwright inside Docker (single container per job)
+# Executor: prewarmed pool of Playwright servers in Docker (one browser each)
 # -----------------------------------------------------------------------------
-PLAYWRIGHT_RUNNER = r"""
-import json
-import os
-import asyncio
-from playwright.async_api import async_playwright
-
-REQ_PATH = "/work/request.json"
-OUT_PATH = "/work/result.json"
-FINAL_SCREENSHOT_PATH = "/work/final.png"
-
-DOM_PREVIEW_LIMIT = int(os.getenv("DOM_PREVIEW_LIMIT", "1000"))
-
-def dom_preview(html: str) -> str:
-    html = html.replace("\n", " ").replace("\t", " ")
-    return html[:DOM_PREVIEW_LIMIT]
-
-async def click_by_text(page, text: str):
-    # Prefer accessible roles
-    loc = page.get_by_role("button", name=text)
-    if await loc.count() == 0:
-        loc = page.get_by_role("link", name=text)
-    if await loc.count() == 0:
-        # Last resort: raw text locator
-        loc = page.locator(f"text={text}")
-    await loc.first.click(timeout=15000)
-
-async def type_by_label(page, label: str, value: str):
-    loc = page.get_by_label(label)
-    if await loc.count() == 0:
-        loc = page.get_by_placeholder(label)
-    if await loc.count() == 0:
-        # Last resort: try text=label then nearest textarea/input
-        loc = page.locator(f"text={label}").locator("..").locator("textarea, input")
-    await loc.first.fill(value, timeout=15000)
-
-async def main():
-    with open(REQ_PATH, "r", encoding="utf-8") as f:
-        req = json.load(f)
-
-    plan = req["plan"]
-    headless = bool(req.get("headless", True))
-
-    out = {
-        "ok": True,
-        "steps": [],
-        "final_url": None,
-        "final_title": None,
-        "final_dom_preview": None,
-        "final_screenshot": "artifacts/final.png",
-    }
-
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=headless)
-        context = await browser.new_context(viewport={"width": 1200, "height": 900})
-        page = await context.new_page()
-
-        for idx, step in enumerate(plan):
-            tool = step["tool"]
-            args = step["args"]
-            step_out = {"idx": idx, "tool": tool, "args": args, "ok": True, "error": None, "url": None, "title": None}
-
-            try:
-                if tool == "go":
-                    await page.goto(args["url"], wait_until="domcontentloaded", timeout=45000)
+async def run_docker_cli(*args: str) -> Tuple[int, str]:
+    """
+    Run a docker CLI command; returns (returncode, stderr).
+    """
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            "docker", *args,
+            stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE,
+        )
+    except OSError as e:
+        return 127, f"docker CLI not available: {e}"
+    _, stderr_b = await proc.communicate()
+    return proc.returncode, stderr_b.decode("utf-8", errors="replace").strip()
 
-                elif tool == "click":
-                    await click_by_text(page, args["text"])
 
-                elif tool == "type":
-                    await type_by_label(page, args["label"], args["value"])
+async def start_executor_pool() -> None:
+    """
+    Start the prewarmed executor containers (called from before_serving):
+      - runner.py is baked into EXECUTOR_IMAGE (/app/runner.py)
+      - Mount ./docker_work -> /work at creation (shared artifacts)
+      - Replace any stale containers with the same names
+      - Publish each runner's HTTP port on 127.0.0.1 only
+      - --restart unless-stopped: a crashed runner/Chromium comes back
+    Failures are logged, not fatal: those executors never enter the pool.
+    """
+    await run_docker_cli("rm", "-f", *EXECUTOR_NAMES)
+    for i, name in enumerate(EXECUTOR_NAMES):
+        code, err = await run_docker_cli(
+            "run", "-d", "--restart", "unless-stopped",
+            "--name", name,
+            "-p", f"127.0.0.1:{EXECUTOR_PORT + i}:9222",
+            "-v", f"{DOCKER_WORK_DIR.resolve()}:/work",
+            "-e", f"DOM_PREVIEW_LIMIT={DOM_PREVIEW_LIMIT}",
+            EXECUTOR_IMAGE,
+            "python", "/app/runner.py",
+        )
+        if code != 0:
+            app.logger.error("docker run %s failed (%s): %s", name, code, err)
 
-                else:
-                    raise ValueError(f"Unknown tool: {tool}")
 
-                step_out["url"] = page.url
-                step_out["title"] = await page.title()
+async def stop_executor_pool() -> None:
+    code, err = await run_docker_cli("rm", "-f", *EXECUTOR_NAMES)
+    if code != 0:
+        app.logger.warning("docker rm executors failed (%s): %s", code, err)
 
-            except Exception as e:
-                step_out["ok"] = False
-                step_out["error"] = str(e)
-                out["ok"] = False
 
-            out["steps"].append(step_out)
-            if not step_out["ok"]:
-                break
+async def readmit_executor(url: str) -> None:
+    """
+    Put an executor (back) into the pool once GET /health answers.
+    Keeps probing while the container is (re)starting.
+    """
+    while not await wait_executor_healthy(url, EXECUTOR_BOOT_TIMEOUT):
+        app.logger.warning(
+            "executor %s not healthy after %ss, still waiting", url, EXECUTOR_BOOT_TIMEOUT)
+    global executor_ever_healthy
+    executor_ever_healthy = True
+    executor_pool.put_nowait(url)
 
-        out["final_url"] = page.url
-        out["final_title"] = await page.title()
 
-        # Final evidence screenshot (always)
-        await page.screenshot(path=FINAL_SCREENSHOT_PATH, full_page=False)
+def schedule_readmit(url: str) -> None:
+    task = asyncio.create_task(readmit_executor(url))
+    executor_tasks.add(task)
+    task.add_done_callback(executor_tasks.discard)
 
-        # Minimal DOM preview (demo)
-        html = await page.content()
-        out["final_dom_preview"] = dom_preview(html)
 
-        await context.close()
-        await browser.close()
+async def executor_failure(
+    executor_url: str, error: str, **extra: Any
+) -> Dict[str, Any]:
+    """
+    Error result for a failed run, with the tail of that container's
+    `docker logs` (runner traceback, Chromium crash + restart, ...).
+    """
+    name = EXECUTOR_NAMES[EXECUTOR_URLS.index(executor_url)]
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            "docker", "logs", "--tail", "50", name,
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT,
+        )
+        out_b, _ = await proc.communicate()
+        docker_logs = out_b.decode("utf-8", errors="replace")[-3000:]
+    except OSError as e:
+        docker_logs = f"docker CLI not available: {e}"
+    return {
+        "ok": False,
+        "error": error,
+        **extra,
+        "logs": {"executor": executor_url, "docker_logs": docker_logs},
+    }
 
-    with open(OUT_PATH, "w", encoding="utf-8") as f:
-        json.dump(out, f, ensure_ascii=False, indent=2)
 
-if __name__ == "__main__":
-    asyncio.run(main())
-""".strip()
+def link_or_copy(src: Path, dst: Path) -> None:
+    """
+    Hardlink src to dst (O(1), no bytes through Python).
+    Falls back to a kernel-side copy across filesystems or when linking is refused.
+    """
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
 
 
-async def run_in_docker(run_id: str, plan: List[Dict[str, Any]], headless: bool = True) -> Dict[str, Any]:
+async def wait_executor_healthy(url: str, timeout: float) -> bool:
+    """
+    Poll the runner's GET /health until it answers 200 or timeout expires.
+    Any transport error means "not up yet": Docker's userland proxy accepts
+    connections on a published port before the runner listens, then resets them.
     """
-    Run the executor in Docker:
-      - Write request.json + runner.py into ./docker_work/
-      - Mount ./docker_work -> /work
-      - Copy /work/final.png + /work/result.json into ./artifacts
+    deadline = asyncio.get_running_loop().time() + timeout
+    while True:
+        try:
+            async with executor_session.get(
+                f"{url}/health", timeout=aiohttp.ClientTimeout(total=2)
+            ) as resp:
+                if resp.status == 200:
+                    return True
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            pass
+        if asyncio.get_running_loop().time() >= deadline:
+            return False
+        await asyncio.sleep(0.5)
+
+
+async def run_in_docker(run_id: str, plan: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Dispatch a plan to an idle container from the prewarmed executor pool:
+      - POST {run_id, plan} to that runner's /run endpoint
+      - Runner writes /work/<run_id>/final.png + result.json (shared volume)
+        and answers with the screenshot as base64
+      - Hardlink final.png + result.json into ./artifacts
     """
     work_run_dir = DOCKER_WORK_DIR / run_id
-    work_run_dir.mkdir(parents=True, exist_ok=True)
-
-    request_path = work_run_dir / "request.json"
-    runner_path = work_run_dir / "runner.py"
     result_path = work_run_dir / "result.json"
     final_path = work_run_dir / "final.png"
 
-    request_path.write_text(
-        json.dumps({"plan": plan, "headless": headless},
-                   ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
-    runner_path.write_text(PLAYWRIGHT_RUNNER, encoding="utf-8")
-
-    # Run container
-    cmd = [
-        "docker", "run", "--rm",
-        "-v", f"{work_run_dir.resolve()}:/work",
-        "-e", f"DOM_PREVIEW_LIMIT={DOM_PREVIEW_LIMIT}",
-        EXECUTOR_IMAGE,
-        "python", "/work/runner.py",
-    ]
-
-    proc = await asyncio.create_subprocess_exec(
-        *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-    )
-    stdout_b, stderr_b = await proc.communicate()
-    stdout = stdout_b.decode("utf-8", errors="replace")
-    stderr = stderr_b.decode("utf-8", errors="replace")
-
-    if proc.returncode != 0:
-        return {
-            "ok": False,
-            "docker_returncode": proc.returncode,
-            "stdout": stdout[-3000:],
-            "stderr": stderr[-3000:],
-        }
+    # Wait for an idle (healthy) executor, at most one run's worth of time;
+    # it goes back to the pool afterwards, or through readmit_executor
+    # (health probe) if the request failed.
+    # The POST itself is not retried: a plan may have started before a failure.
+    try:
+        executor_url = await asyncio.wait_for(
+            executor_pool.get(), EXECUTOR_TIMEOUT)
+    except asyncio.TimeoutError:
+        if not executor_ever_healthy:
+            return {"ok": False, "error": "No healthy executor available"}
+        return {"ok": False, "error": "All executors busy, try again later"}
+    answered = False
+    try:
+        async with executor_session.post(
+            f"{executor_url}/run",
+            data=orjson.dumps({"run_id": run_id, "plan": plan}),
+            headers={"Content-Type": "application/json"},
+        ) as resp:
+            status = resp.status
+            body = await resp.read()
+        answered = True
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        return await executor_failure(executor_url, f"Executor request failed: {e!r}")
+    finally:
+        if answered:
+            executor_pool.put_nowait(executor_url)
+        else:
+            schedule_readmit(executor_url)
+
+    if status != 200:
+        # The runner answers failures with {"ok", "error", "traceback"}
+        try:
+            detail = orjson.loads(body)
+        except orjson.JSONDecodeError:
+            detail = None
+        if not isinstance(detail, dict):
+            detail = {"error": body[-3000:].decode("utf-8", errors="replace")}
+        return await executor_failure(
+            executor_url,
+            detail.get("error") or f"Executor returned HTTP {status}",
+            executor_status=status,
+            traceback=detail.get("traceback"),
+        )
 
     if not result_path.exists() or not final_path.exists():
-        return {
-            "ok": False,
-            "docker_returncode": proc.returncode,
-            "stdout": stdout[-2000:],
-            "stderr": (stderr + "\nMissing result.json or final.png")[-3000:],
-        }
-
-    # Copy artifacts to top-level ./artifacts for easy demo navigation
+        return await executor_failure(
+            executor_url, "Missing result.json or final.png", executor_status=status)
+
+    # Expose artifacts in top-level ./artifacts for easy demo navigation
     final_out = ARTIFACTS_DIR / f"{run_id}_final.png"
     json_out = ARTIFACTS_DIR / f"{run_id}_output.json"
-    final_out.write_bytes(final_path.read_bytes())
-    json_out.write_text(result_path.read_text(
-        encoding="utf-8"), encoding="utf-8")
+    link_or_copy(final_path, final_out)
+    link_or_copy(result_path, json_out)
 
-    result = json.loads(json_out.read_text(encoding="utf-8"))
+    # result.json is read + parsed once; raw bytes are kept for the DB write
+    result_raw = result_path.read_bytes()
     return {
         "ok": True,
         "run_id": run_id,
-        "result": result,
+        "result": orjson.loads(result_raw),
+        "result_raw": result_raw,
         "final_screenshot": str(final_out),
+        "final_screenshot_b64": orjson.loads(body)["final_screenshot_b64"],
         "final_output_json": str(json_out),
-        "logs": {"stdout": stdout[-2000:], "stderr": stderr[-2000:]},
+        "logs": {"executor": executor_url, "executor_status": status},
     }
 
 
 # -----------------------------------------------------------------------------
-# Flask routes
+# Quart routes (ASGI: one event loop shared by all in-flight runs)
 # -----------------------------------------------------------------------------
 @app.get("/")
-def home():
-    return render_template(
+async def home():
+    return await render_template(
         "index.html",
         groq_text_model=GROQ_TEXT_MODEL,
         groq_vision_model=GROQ_VISION_MODEL,
@@ -463,7 +635,7 @@ def home():
 
 @app.post("/api/plan")
 async def api_plan():
-    data = request.get_json(force=True) or {}
+    data = (await request.get_json(force=True)) or {}
     goal = (data.get("goal") or "").strip()
     note_text = (data.get("note_text") or "").strip(
     ) or "Shibuya Tokyo Cyberpunk demo note."
@@ -476,7 +648,7 @@ async def api_plan():
 
 @app.post("/api/run")
 async def api_run():
-    data = request.get_json(force=True) or {}
+    data = (await request.get_json(force=True)) or {}
 
     goal = (data.get("goal") or "").strip()
     note_text = (data.get("note_text") or "").strip(
@@ -497,25 +669,14 @@ async def api_run():
     run_id = uuid.uuid4().hex[:10]
     created_at = dt.datetime.utcnow().isoformat()
 
-    with db() as conn:
-        conn.execute(
-            "INSERT INTO runs (id, created_at, user_goal, plan_json) VALUES (?, ?, ?, ?)",
-            (run_id, created_at, goal, json.dumps(plan, ensure_ascii=False)),
-        )
-
-    exec_out = await run_in_docker(run_id, plan, headless=True)
+    exec_out = await run_in_docker(run_id, plan)
 
     if not exec_out.get("ok"):
-        with db() as conn:
-            conn.execute(
-                "UPDATE runs SET result_json=? WHERE id=?",
-                (json.dumps(exec_out, ensure_ascii=False), run_id),
-            )
+        save_run(run_id, created_at, goal, plan, exec_out)
         return jsonify(exec_out), 500
 
     # Optional: vision verification from final screenshot
-    final_ss = Path(exec_out["final_screenshot"])
-    vision_summary = await groq_vision_verify(final_ss)
+    vision_summary = await groq_vision_verify(exec_out["final_screenshot_b64"])
 
     payload = {
         "ok": True,
@@ -528,20 +689,16 @@ async def api_run():
         "logs": exec_out["logs"],
     }
 
-    with db() as conn:
-        conn.execute(
-            "UPDATE runs SET result_json=? WHERE id=?",
-            (json.dumps(payload, ensure_ascii=False), run_id),
-        )
+    # Store the executor's result bytes as-is instead of re-encoding the dict
+    save_run(run_id, created_at, goal, plan,
+             dict(payload, result=orjson.Fragment(exec_out["result_raw"])))
 
     return jsonify(payload)
 
 
 # app.py (optional: add favicon route to avoid 404 noise)
-from flask import send_from_directory
-
 @app.get("/favicon.ico")
-def favicon():
+async def favicon():
     # no file shipped; return 204 (no content) to keep logs clean
     return ("", 204)
 
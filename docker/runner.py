@@ -0,0 +1,188 @@
+# docker/runner.py
+# Executor server baked into the image (see docker/Dockerfile).
+import json
+import os
+import re
+import base64
+import traceback
+from pathlib import Path
+
+from aiohttp import web
+from playwright.async_api import async_playwright
+
+WORK_DIR = Path("/work")
+EXECUTOR_PORT = int(os.getenv("EXECUTOR_PORT", "9222"))
+
+DOM_PREVIEW_LIMIT = int(os.getenv("DOM_PREVIEW_LIMIT", "1000"))
+
+# File extensions never fetched: images, fonts, media (stylesheets are kept:
+# layout drives visibility and accessible-role lookups). The regex is matched by
+# the Playwright driver, so only blocked requests reach the Python route handler.
+BLOCKED_EXTENSIONS = [ext for ext in os.getenv(
+    "BLOCKED_EXTENSIONS",
+    "png,jpg,jpeg,gif,webp,avif,svg,ico,woff,woff2,ttf,otf,eot,mp4,webm,mp3,ogg",
+).split(",") if ext]
+BLOCKED_URL_RE = re.compile(
+    r"\.(?:" + "|".join(map(re.escape, BLOCKED_EXTENSIONS)) + r")(?:[?#]|$)",
+    re.IGNORECASE,
+)
+
+_PREVIEW_TRANS = str.maketrans({"\n": " ", "\t": " "})
+
+def dom_preview(html: str) -> str:
+    # Slice first so translate only scans DOM_PREVIEW_LIMIT chars
+    return html[:DOM_PREVIEW_LIMIT].translate(_PREVIEW_TRANS)
+
+async def block_heavy(route):
+    await route.abort()
+
+async def go(page, url: str):
+    # Only wait for the navigation to commit: click/fill auto-wait for their
+    # own target element, not for unrelated images or third-party scripts
+    await page.goto(url, wait_until="commit", timeout=45000)
+
+async def click_by_text(page, text: str):
+    # Button role, link role or raw text. .or_() matches in document order
+    # (not in that priority order), so keep visible nodes only: text= also
+    # matches hidden copies (cart drawer, sticky header) earlier in the DOM.
+    # Resolved in the browser by the click itself (no count() round-trips).
+    loc = (
+        page.get_by_role("button", name=text)
+        .or_(page.get_by_role("link", name=text))
+        .or_(page.locator(f"text={text}"))
+        .filter(visible=True)
+    )
+    await loc.first.click(timeout=15000)
+
+async def type_by_label(page, label: str, value: str):
+    # Label, placeholder or text=label's nearest textarea/input: first
+    # visible match in document order (see click_by_text)
+    loc = (
+        page.get_by_label(label)
+        .or_(page.get_by_placeholder(label))
+        .or_(page.locator(f"text={label}").locator("..").locator("textarea, input"))
+        .filter(visible=True)
+    )
+    await loc.first.fill(value, timeout=15000)
+
+TOOL_FN = {"go": go, "click": click_by_text, "type": type_by_label}
+
+def compile_plan(plan):
+    # Resolve each step's tool function once, before touching the browser
+    return [(step["tool"], TOOL_FN.get(step["tool"]), step["args"]) for step in plan]
+
+def encode_image_b64(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii")
+
+async def run_plan(browser, run_dir: Path, plan):
+    out = {
+        "ok": True,
+        "steps": [],
+        "final_url": None,
+        "final_title": None,
+        "final_dom_preview": None,
+        "final_screenshot": "artifacts/final.png",
+    }
+
+    # A fresh context per run is cheap; the browser itself stays up.
+    context = await browser.new_context(viewport={"width": 1200, "height": 900})
+    if BLOCKED_EXTENSIONS:
+        await context.route(BLOCKED_URL_RE, block_heavy)
+    try:
+        page = await context.new_page()
+
+        for idx, (tool, fn, args) in enumerate(compile_plan(plan)):
+            step_out = {"idx": idx, "tool": tool, "args": args, "ok": True, "error": None, "url": None, "title": None}
+
+            try:
+                if fn is None:
+                    raise ValueError(f"Unknown tool: {tool}")
+                await fn(page, **args)
+
+                step_out["url"] = page.url
+                # go() returns at "commit": the title is not parsed yet
+                if tool != "go":
+                    step_out["title"] = await page.title()
+
+            except Exception as e:
+                step_out["ok"] = False
+                step_out["error"] = str(e)
+                out["ok"] = False
+
+            out["steps"].append(step_out)
+            if not step_out["ok"]:
+                break
+
+        # go() returns at "commit": let the DOM settle before final evidence
+        try:
+            await page.wait_for_load_state("domcontentloaded", timeout=15000)
+        except Exception:
+            pass
+
+        out["final_url"] = page.url
+        out["final_title"] = await page.title()
+
+        # Final evidence screenshot (always)
+        # (bytes are kept so the app gets them without re-reading the file)
+        png = await page.screenshot(path=str(run_dir / "final.png"), full_page=False)
+
+        # Minimal DOM preview (demo)
+        html = await page.content()
+        out["final_dom_preview"] = dom_preview(html)
+    finally:
+        await context.close()
+
+    with open(run_dir / "result.json", "w", encoding="utf-8") as f:
+        json.dump(out, f, ensure_ascii=False, indent=2)
+    return out, png
+
+async def handle_run(request):
+    try:
+        req = await request.json()
+        # run_id is generated by app.py; keep only the last path component anyway
+        run_dir = WORK_DIR / Path(req["run_id"]).name
+        run_dir.mkdir(parents=True, exist_ok=True)
+        out, png = await run_plan(request.app["browser"], run_dir, req["plan"])
+    except Exception as e:
+        # Report the failure to app.py as JSON (and in `docker logs`)
+        # instead of aiohttp's generic 500 page
+        tb = traceback.format_exc()
+        print(tb, flush=True)
+        return web.json_response(
+            {"ok": False, "error": repr(e), "traceback": tb[-3000:]}, status=500)
+    # The full result is serialized once, into result.json (shared volume);
+    # the response only carries the status + screenshot (not in result.json)
+    return web.json_response({"ok": out["ok"], "final_screenshot_b64": encode_image_b64(png)})
+
+async def handle_health(request):
+    # The server only listens once browser_ctx has launched Chromium
+    if not request.app["browser"].is_connected():
+        return web.json_response({"ok": False}, status=503)
+    return web.json_response({"ok": True})
+
+async def browser_ctx(app):
+    # Launch Chromium once for the lifetime of the container
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        app["browser"] = browser
+        app["closing"] = False
+
+        def on_disconnected(_):
+            # Chromium died: exit so Docker's restart policy brings up a fresh runner
+            if not app["closing"]:
+                os._exit(1)
+
+        browser.on("disconnected", on_disconnected)
+        yield
+        app["closing"] = True
+        await browser.close()
+
+def main():
+    app = web.Application()
+    app.cleanup_ctx.append(browser_ctx)
+    app.router.add_post("/run", handle_run)
+    app.router.add_get("/health", handle_health)
+    web.run_app(app, host="0.0.0.0", port=EXECUTOR_PORT)
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,10 @@
 Mirror of requirements.txt (some students prefer a Python-readable list).
 """
 REQUIREMENTS = [
-    "flask>=3.0.0",
-    "groq>=0.12.0",
+    "quart>=0.19.0",
+    "hypercorn>=0.16.0",
+    "groq[aiohttp]>=0.30.0",
+    "aiohttp>=3.9.0",
+    "fastjsonschema>=2.19.0",
+    "orjson>=3.10.0",
 ]